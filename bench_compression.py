@@ -0,0 +1,63 @@
+import argparse
+import gzip
+import json
+import random
+import time
+
+# Uses the handler's own threshold and levels so results match what is deployed
+from get_transactions import brotli, COMPRESSION_MIN_BYTES, GZIP_LEVEL, BROTLI_QUALITY
+
+DESCRIPTIONS = ["ATM Withdrawal", "Salary Deposit", "Grocery Store", "Online Purchase", "Check Deposit"]
+
+
+# CLI ARGUMENT PARSER
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure CPU cost versus bytes saved for response compression")
+    parser.add_argument('--sizes', default=f"{COMPRESSION_MIN_BYTES // 2},{COMPRESSION_MIN_BYTES},20000,500000",
+                        help='Comma-separated target body sizes in bytes')
+    parser.add_argument('--repeat', type=int, default=20, help='Compressions per measurement')
+    parser.add_argument('--seed', type=int, default=1610, help='Random seed for the synthetic payload')
+    return parser.parse_args()
+
+# BUILD A RESPONSE BODY SHAPED LIKE THE READ HANDLERS' OUTPUT
+def make_body(target_bytes, rng):
+    rows = []
+    body = json.dumps({'status': "ok", 'data': rows})
+    while len(body) < target_bytes:
+        rows.append({
+            "transaction_id": 1000 + len(rows),
+            "account_id": rng.choice([101, 102, 103, 104]),
+            "amount": f"{rng.uniform(-500, 500):.2f}",
+            "description": rng.choice(DESCRIPTIONS)
+        })
+        body = json.dumps({'status': "ok", 'data': rows})
+    return body.encode('utf-8')
+
+def codecs():
+    levels = sorted({1, GZIP_LEVEL, 9})
+    for level in levels:
+        yield f"gzip-{level}", lambda raw, level=level: gzip.compress(raw, compresslevel=level)
+    if brotli:
+        for quality in sorted({1, BROTLI_QUALITY, 11}):
+            yield f"br-{quality}", lambda raw, quality=quality: brotli.compress(raw, quality=quality)
+    else:
+        print("brotli not installed; skipping br")
+
+def measure(compress, raw, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        compressed = compress(raw)
+    return len(compressed), (time.perf_counter() - start) / repeat
+
+# MAIN
+if __name__ == '__main__':
+    args = parse_args()
+    rng = random.Random(args.seed)
+    print(f"Compression threshold: {COMPRESSION_MIN_BYTES} bytes (smaller bodies are sent uncompressed)")
+    print(f"{'body bytes':>12} {'codec':>8} {'out bytes':>10} {'saved':>7} {'ms':>9} {'MB/s':>8}")
+    for target in [int(size) for size in args.sizes.split(',')]:
+        raw = make_body(target, rng)
+        for name, compress in codecs():
+            size, seconds = measure(compress, raw, args.repeat)
+            saved = 100 * (1 - size / len(raw))
+            print(f"{len(raw):>12} {name:>8} {size:>10} {saved:>6.1f}% {seconds * 1000:>9.3f} {len(raw) / seconds / 1e6:>8.1f}")
@@ -0,0 +1,86 @@
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from decimal import Decimal
+
+# Uses the handlers' own row classes and serializers so results match what is deployed
+from get_accounts import row_class, serialize_rows
+from export_transactions import encode_rows
+
+COLUMNS = ('transaction_id', 'account_id', 'customer_id', 'account_type', 'amount', 'description')
+DESCRIPTIONS = ["ATM Withdrawal", "Salary Deposit", "Grocery Store", "Online Purchase", "Check Deposit"]
+
+
+# CLI ARGUMENT PARSER
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare DictCursor rows with compact tuple rows")
+    parser.add_argument('--rows', type=int, default=200000, help='Number of Transactions rows to simulate')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per timing; the best is reported')
+    parser.add_argument('--seed', type=int, default=1610, help='Random seed for the synthetic rows')
+    return parser.parse_args()
+
+# TUPLES AS PYMYSQL RETURNS THEM, BEFORE ANY CURSOR CLASS WRAPS THEM
+def make_tuples(count, rng):
+    return [
+        (1000 + i, rng.choice([101, 102, 103, 104]), 1, rng.choice(["savings", "checking"]),
+         Decimal(f"{rng.uniform(-500, 500):.2f}"), rng.choice(DESCRIPTIONS))
+        for i in range(count)
+    ]
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def traced_bytes(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+def report(name, count, seconds):
+    print(f"  {name:<34} {seconds * 1000:>9.1f} ms {count / seconds / 1000:>9.0f}k rows/s")
+
+# MAIN
+if __name__ == '__main__':
+    args = parse_args()
+    tuples = make_tuples(args.rows, random.Random(args.seed))
+    cls = row_class(COLUMNS)
+
+    # DictCursor does the equivalent of dict(zip(columns, row)) for every row
+    build_dicts = lambda: [dict(zip(COLUMNS, row)) for row in tuples]
+    build_compact = lambda: list(map(cls, tuples))
+
+    dict_rows, dict_bytes = traced_bytes(build_dicts)
+    compact_rows, compact_bytes = traced_bytes(build_compact)
+    print(f"{args.rows} rows, {len(COLUMNS)} columns")
+    print(f"Memory per row: DictCursor {dict_bytes / args.rows:.0f} B, compact {compact_bytes / args.rows:.0f} B")
+
+    print("Build rows:")
+    report("DictCursor dicts", args.rows, best_time(build_dicts, args.repeat)[1])
+    report("compact rows", args.rows, best_time(build_compact, args.repeat)[1])
+
+    print("Serialize JSON array (get_accounts response body):")
+    expected, dict_seconds = best_time(lambda: json.dumps(dict_rows, default=str), args.repeat)
+    actual, compact_seconds = best_time(lambda: serialize_rows(compact_rows), args.repeat)
+    report("json.dumps(dict rows)", args.rows, dict_seconds)
+    report("serialize_rows(compact rows)", args.rows, compact_seconds)
+    print(f"  identical output: {expected == actual}")
+
+    print("Encode NDJSON (export_transactions):")
+    expected, dict_seconds = best_time(
+        lambda: ''.join(json.dumps(row, default=str) + '\n' for row in dict_rows).encode('utf-8'), args.repeat)
+    actual, compact_seconds = best_time(
+        lambda: encode_rows(list(COLUMNS), tuples, 'ndjson', True), args.repeat)
+    report("json.dumps per dict row", args.rows, dict_seconds)
+    report("encode_rows(tuples)", args.rows, compact_seconds)
+    print(f"  identical output: {expected == actual}")
@@ -0,0 +1,300 @@
+import boto3
+import pymysql
+import os
+import io
+import csv
+import json
+import time
+import zlib
+from json.encoder import encode_basestring_ascii
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pymysql.cursors import DictCursor, SSCursor
+
+class MySQLHelper:
+    def __init__(self, host, port, user, password, db):
+        try:
+            self.connection = pymysql.connect(
+                host=host,
+                port=int(port),
+                user=user,
+                password=password,
+                database=db,
+                cursorclass=DictCursor,
+                autocommit=True
+            )
+        except Exception as e:
+            print(f"Failed to connect to database: {e}")
+            self.connection = None
+
+    def stream_query(self, query, params=None, fetch_size=1000):
+        # Unbuffered server-side cursor: rows stay on the server until fetched,
+        # so memory is bounded by fetch_size rather than the result size
+        with self.connection.cursor(SSCursor) as cursor:
+            cursor.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                yield columns, rows
+
+    def close(self):
+        if self.connection:
+            try:
+                self.connection.close()
+            except Exception as e:
+                print(f"Failed to close connection: {e}")
+        else:
+            print("No database connection to close.")
+
+ACCOUNT_TABLE= "Accounts"
+TRANSACTIONS_TABLE = "Transactions"
+CUSTOMERS_TABLE = "Customers"
+
+EXPORT_BUCKET = os.environ.get('EXPORT_BUCKET')
+# Point at a local S3 stand-in (MinIO, LocalStack, moto server) for testing
+S3_ENDPOINT_URL = os.environ.get('S3_ENDPOINT_URL')
+EXPORT_FETCH_SIZE = int(os.environ.get('EXPORT_FETCH_SIZE', 1000))
+# S3 requires every part except the last to be at least 5 MiB
+EXPORT_PART_SIZE = max(int(os.environ.get('EXPORT_PART_SIZE', 8 * 1024 * 1024)), 5 * 1024 * 1024)
+# Memory stays around EXPORT_PART_SIZE * (EXPORT_MAX_IN_FLIGHT_PARTS + 1)
+EXPORT_MAX_IN_FLIGHT_PARTS = int(os.environ.get('EXPORT_MAX_IN_FLIGHT_PARTS', 4))
+GZIP_LEVEL = 6
+
+EXPORT_FORMATS = ['ndjson', 'csv']
+# Objects are stored as .gz files; no Content-Encoding, so downloads stay compressed
+EXPORT_CONTENT_TYPE = 'application/gzip'
+
+EXPORT_QUERY = """
+    SELECT
+        t.transaction_id,
+        t.account_id,
+        a.customer_id,
+        a.account_type,
+        t.amount,
+        t.description
+    FROM Transactions t
+    INNER JOIN Accounts a ON t.account_id = a.account_id
+"""
+
+def parse_id(name, value):
+    # int() would silently truncate 1.7 or accept True, so only whole numbers
+    # given as ints or decimal-digit strings select rows
+    if type(value) is int:
+        return value
+    if isinstance(value, str) and value.isascii() and value.isdigit():
+        return int(value)
+    raise ValueError(f"{name} must be an integer, got {value!r}")
+
+def build_export_query(customer_id=None, from_transaction_id=None, to_transaction_id=None):
+    conditions = []
+    params = []
+    if customer_id is not None:
+        conditions.append("a.customer_id = %s")
+        params.append(parse_id('customer_id', customer_id))
+    if from_transaction_id is not None:
+        conditions.append("t.transaction_id >= %s")
+        params.append(parse_id('from_transaction_id', from_transaction_id))
+    if to_transaction_id is not None:
+        conditions.append("t.transaction_id <= %s")
+        params.append(parse_id('to_transaction_id', to_transaction_id))
+
+    query = EXPORT_QUERY
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY t.transaction_id"
+    return query, params
+
+# JSON encoding straight from row tuples: keys are pre-encoded once per
+# shape into a template, and each column is encoded with a single C-level
+# map, so no per-row dicts are built. Output matches json.dumps(default=str).
+VALUE_ENCODERS = {
+    int: int.__repr__,
+    float: float.__repr__,
+    str: encode_basestring_ascii,
+    bool: lambda value: 'true' if value else 'false',
+    type(None): lambda value: 'null'
+}
+
+def encode_other(value):
+    return encode_basestring_ascii(str(value))
+
+def object_template(columns):
+    return '{' + ', '.join(json.dumps(name).replace('%', '%%') + ': %s' for name in columns) + '}'
+
+def encode_column(values):
+    kinds = set(map(type, values))
+    if len(kinds) == 1:
+        encode = VALUE_ENCODERS.get(kinds.pop())
+        if encode is None:
+            return list(map(encode_basestring_ascii, map(str, values)))
+        return list(map(encode, values))
+    return [VALUE_ENCODERS.get(type(value), encode_other)(value) for value in values]
+
+def encode_objects(template, rows):
+    encoded = [encode_column(column) for column in zip(*rows)]
+    return list(map(template.__mod__, zip(*encoded)))
+
+def encode_rows(columns, rows, export_format, include_header):
+    if export_format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if include_header:
+            writer.writerow(columns)
+        writer.writerows(rows)
+        return buffer.getvalue().encode('utf-8')
+    lines = encode_objects(object_template(columns), rows)
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+class MultipartUploader:
+    def __init__(self, s3, bucket, key, content_type, part_size, max_in_flight):
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.max_in_flight = max_in_flight
+        self.buffer = bytearray()
+        self.part_number = 0
+        self.pending = set()
+        self.parts = []
+        self.bytes_uploaded = 0
+        self.pool = ThreadPoolExecutor(max_workers=max_in_flight)
+        response = s3.create_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            ContentType=content_type
+        )
+        self.upload_id = response['UploadId']
+
+    def write(self, data):
+        self.buffer += data
+        while len(self.buffer) >= self.part_size:
+            self._submit(bytes(self.buffer[:self.part_size]))
+            del self.buffer[:self.part_size]
+
+    def _submit(self, body):
+        # Block until a slot frees up so at most max_in_flight parts sit in memory
+        while len(self.pending) >= self.max_in_flight:
+            done, self.pending = wait(self.pending, return_when=FIRST_COMPLETED)
+            self._collect(done)
+        self.part_number += 1
+        self.pending.add(self.pool.submit(self._upload_part, self.part_number, body))
+
+    def _upload_part(self, part_number, body):
+        response = self.s3.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body
+        )
+        print(f"Uploaded part {part_number} ({len(body)} bytes)")
+        return {'PartNumber': part_number, 'ETag': response['ETag']}, len(body)
+
+    def _collect(self, done):
+        for future in done:
+            part, size = future.result()
+            self.parts.append(part)
+            self.bytes_uploaded += size
+
+    def complete(self):
+        # The last part may be smaller than part_size, and an upload needs at least one part
+        if self.buffer or self.part_number == 0:
+            self._submit(bytes(self.buffer))
+            self.buffer = bytearray()
+        done, self.pending = wait(self.pending)
+        self._collect(done)
+        self.pool.shutdown()
+        self.parts.sort(key=lambda part: part['PartNumber'])
+        self.s3.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={'Parts': self.parts}
+        )
+
+    def abort(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        try:
+            self.s3.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+        except Exception as e:
+            print(f"Failed to abort multipart upload '{self.upload_id}': {e}")
+
+def export_rows(batches, uploader, export_format):
+    # wbits=31 makes zlib emit a gzip container
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    row_count = 0
+    include_header = True
+    for columns, rows in batches:
+        uploader.write(compressor.compress(encode_rows(columns, rows, export_format, include_header)))
+        include_header = False
+        row_count += len(rows)
+    uploader.write(compressor.flush())
+    return row_count
+
+def lambda_handler(event, context):
+    export_format = event.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return {"status": "Error", "message": f"Unsupported format '{export_format}', use one of {EXPORT_FORMATS}"}
+
+    customer_id = event.get('customer_id')
+    try:
+        query, params = build_export_query(
+            customer_id,
+            event.get('from_transaction_id'),
+            event.get('to_transaction_id')
+        )
+    except ValueError as e:
+        return {"status": "Error", "message": str(e)}
+
+    bucket = event.get('bucket', EXPORT_BUCKET)
+    key = event.get('key') or (
+        f"exports/transactions-{customer_id if customer_id is not None else 'all'}-"
+        f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}.{export_format}.gz"
+    )
+
+    secret_name = os.environ['SECRET_NAME']
+    region_name = os.environ.get('AWS_REGION', 'ap-south-1')
+
+    client = boto3.client('secretsmanager', region_name=region_name)
+    secret = json.loads(client.get_secret_value(SecretId=secret_name)['SecretString'])
+    s3 = boto3.client('s3', region_name=region_name, endpoint_url=S3_ENDPOINT_URL)
+
+    mysqlhelper = None
+    uploader = None
+    try:
+        mysqlhelper = MySQLHelper(
+            host=os.environ['DB_HOST'],
+            user=secret['username'],
+            password=secret['password'],
+            db=os.environ['DB_NAME'],
+            port=3306
+        )
+        if not mysqlhelper.connection:
+            return {"status": "Error", "message": "No database connection."}
+
+        print(f"Exporting transactions to s3://{bucket}/{key}")
+        uploader = MultipartUploader(s3, bucket, key, EXPORT_CONTENT_TYPE, EXPORT_PART_SIZE, EXPORT_MAX_IN_FLIGHT_PARTS)
+        batches = mysqlhelper.stream_query(query, params, EXPORT_FETCH_SIZE)
+        row_count = export_rows(batches, uploader, export_format)
+        uploader.complete()
+        print(f"Exported {row_count} rows in {len(uploader.parts)} parts ({uploader.bytes_uploaded} bytes)")
+
+        return {
+            "status": "Success",
+            "bucket": bucket,
+            "key": key,
+            "rows": row_count,
+            "parts": len(uploader.parts),
+            "bytes": uploader.bytes_uploaded
+        }
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        if uploader:
+            uploader.abort()
+        return {"status": "Error", "message": str(e)}
+    finally:
+        if mysqlhelper:
+            mysqlhelper.close()
@@ -2,23 +2,123 @@ import boto3
 import pymysql
 import os
 import json
-from pymysql.cursors import DictCursor
+import gzip
+import base64
+import time
+import random
+import hmac
+import hashlib
+import io
+import cProfile
+import pstats
+import tracemalloc
+from pymysql.constants import ER
+from pymysql.cursors import Cursor, DictCursor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Global cap on concurrent DB sessions across all containers. Each admitted
+# invocation holds one GET_LOCK slot, which MySQL frees with the session even
+# if the container dies, so no lease cleanup is needed. Queued invocations
+# disconnect between probes, so the budget only needs to leave headroom below
+# max_connections for those brief probe sessions.
+DB_CONNECTION_BUDGET = int(os.environ.get('DB_CONNECTION_BUDGET', 40))
+DB_ADMISSION_WAIT_SECONDS = float(os.environ.get('DB_ADMISSION_WAIT_SECONDS', 2))
+# Short enough that a stalled connect cannot eat the whole function timeout
+DB_CONNECT_TIMEOUT_SECONDS = float(os.environ.get('DB_CONNECT_TIMEOUT_SECONDS', 2))
+# Time kept back after admission for the queries and the response, so a
+# request that cannot be admitted gets its 503 before Lambda times out
+ADMISSION_DEADLINE_MARGIN_SECONDS = float(os.environ.get('ADMISSION_DEADLINE_MARGIN_SECONDS', 3))
+RETRY_AFTER_SECONDS = 1
+
+class ConnectionBudgetExhausted(Exception):
+    pass
+
+def admission_wait_seconds(context):
+    # Queue for at most DB_ADMISSION_WAIT_SECONDS, and less when the function
+    # timeout is closer than that plus the margin needed to answer
+    get_remaining = getattr(context, 'get_remaining_time_in_millis', None)
+    if get_remaining is None:
+        return DB_ADMISSION_WAIT_SECONDS
+    remaining = get_remaining() / 1000 - ADMISSION_DEADLINE_MARGIN_SECONDS
+    return max(0.0, min(DB_ADMISSION_WAIT_SECONDS, remaining))
+
+# Compact row mode: rows stay plain tuples, wrapped in one class per result
+# shape that carries the column labels once instead of a dict per row. Labels
+# can be any SQL result name (COUNT(*), duplicates, keywords). row['name'],
+# get(), keys(), values() and items() read like a DictCursor row (the first
+# column wins for a duplicated label); iteration, len() and `in` keep tuple
+# semantics, so code that loops over a row's keys must call keys().
+ROW_CLASSES = {}
+
+class CompactRow(tuple):
+    __slots__ = ()
+    _fields = ()
+    _index = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            key = self._index[key]
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        position = self._index.get(key)
+        return default if position is None else tuple.__getitem__(self, position)
+
+    def keys(self):
+        return self._index.keys()
+
+    def values(self):
+        return [tuple.__getitem__(self, position) for position in self._index.values()]
+
+    def items(self):
+        return list(zip(self._index, self.values()))
+
+def row_class(columns):
+    columns = tuple(columns)
+    cls = ROW_CLASSES.get(columns)
+    if cls is None:
+        index = {}
+        for position, name in enumerate(columns):
+            index.setdefault(name, position)
+        cls = type('Row', (CompactRow,), {'__slots__': (), '_fields': columns, '_index': index})
+        ROW_CLASSES[columns] = cls
+    return cls
 
 class MySQLHelper:
     def __init__(self, host, port, user, password, db):
+        self.slot = None
+        self.slot_prefix = f"{db}.conn_slot_"
+        self.connect_args = {
+            'host': host,
+            'port': int(port),
+            'user': user,
+            'password': password,
+            'database': db,
+            'cursorclass': DictCursor,
+            'autocommit': True,
+            'connect_timeout': DB_CONNECT_TIMEOUT_SECONDS
+        }
+        self.connect()
+
+    def connect(self, timeout=None):
+        self.connect_error = None
+        connect_args = self.connect_args
+        if timeout is not None:
+            connect_args = {**connect_args, 'connect_timeout': min(timeout, connect_args['connect_timeout'])}
         try:
-            self.connection = pymysql.connect(
-                host=host,
-                port=int(port),
-                user=user,
-                password=password,
-                database=db,
-                cursorclass=DictCursor,
-                autocommit=True
-            )
+            self.connection = pymysql.connect(**connect_args)
         except Exception as e:
             print(f"Failed to connect to database: {e}")
             self.connection = None
+            self.connect_error = e
+
+    def too_many_connections(self):
+        return (isinstance(self.connect_error, pymysql.err.OperationalError)
+                and self.connect_error.args[0] == ER.CON_COUNT_ERROR)
    
     def create_table(self, table_name, columns):
         if not self.connection:
@@ -74,7 +174,7 @@ class MySQLHelper:
             print(f"Failed to get tables: {e}")
             return []
  
-    def select_items(self, table_name, columns="*", where=None):
+    def select_items(self, table_name, columns="*", where=None, compact=False):
         if not self.connection:
             print("No database connection.")
             return []
@@ -85,6 +185,8 @@ class MySQLHelper:
             query = f"SELECT {columns} FROM {table_name}"
             if where:
                 query += f" WHERE {where}"
+            if compact:
+                return self.fetch_rows(query)
             with self.connection.cursor() as cursor:
                 cursor.execute(query)
                 result = cursor.fetchall()
@@ -93,6 +195,51 @@ class MySQLHelper:
             print(f"Failed to select items from '{table_name}': {e}")
             return []
  
+    def fetch_rows(self, query, params=None):
+        # Plain tuple cursor; rows are wrapped in the shared class for this shape
+        with self.connection.cursor(Cursor) as cursor:
+            cursor.execute(query, params)
+            cls = row_class(col[0] for col in cursor.description)
+            return list(map(cls, cursor.fetchall()))
+
+    def try_acquire_slot(self, names):
+        # One statement checks every slot, then a single GET_LOCK claims a free one
+        with self.connection.cursor(Cursor) as cursor:
+            cursor.execute("SELECT " + ", ".join(["IS_FREE_LOCK(%s)"] * len(names)), names)
+            free = [name for name, is_free in zip(names, cursor.fetchone()) if is_free == 1]
+            if not free:
+                return None
+            # Random choice keeps containers from racing for the same slot
+            name = random.choice(free)
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (name,))
+            return name if cursor.fetchone()[0] == 1 else None
+
+    def acquire_connection_slot(self, budget, wait_seconds):
+        names = [f"{self.slot_prefix}{slot}" for slot in range(budget)]
+        deadline = time.monotonic() + wait_seconds
+        delay = 0.05
+        while True:
+            if self.connection:
+                self.slot = self.try_acquire_slot(names)
+                if self.slot:
+                    return self.slot
+            elif not self.too_many_connections():
+                # Bad credentials, DNS failures or an outage are errors, not back-pressure
+                raise self.connect_error
+
+            # Give the session back while queued so waiting containers hold no connections
+            if self.connection:
+                self.close()
+                self.connection = None
+            # Only back off if there is still time to reconnect afterwards, and
+            # never let that reconnect run past the deadline
+            remaining = deadline - time.monotonic()
+            if remaining <= delay:
+                raise ConnectionBudgetExhausted(f"All {budget} connection slots busy after {wait_seconds:.2f}s")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+            self.connect(max(deadline - time.monotonic(), 0.05))
+
     def close(self):
         if self.connection:
             try:
@@ -106,12 +253,204 @@ ACCOUNT_TABLE= "Accounts"
 TRANSACTIONS_TABLE = "Transactions"
 CUSTOMERS_TABLE = "Customers"
 
+# Bump when the response body shape changes so cached ETags stop matching.
+RESPONSE_VERSION = 2
+
+# Cheap per-customer version: a counter in CustomerVersions that triggers on
+# Accounts and Transactions bump on every write (see lambda_function.py), so
+# the check is one primary-key lookup. No row means no writes since the
+# triggers were installed. Writes that bypass triggers (e.g. TRUNCATE) leave
+# the version, and so the ETag, stale.
+TRANSACTIONS_VERSION_QUERY = """
+    SELECT version FROM CustomerVersions WHERE customer_id = %s
+"""
+
+# One round trip for every level: per-account rows, a subtotal per account
+# type, and the customer total. GROUPING() tells the rollup rows apart.
+TRANSACTIONS_ROLLUP_QUERY = """
+    SELECT
+        a.account_type,
+        a.account_id,
+        GROUPING(a.account_type) AS type_rollup,
+        GROUPING(a.account_id) AS account_rollup,
+        COUNT(t.transaction_id) AS transaction_count,
+        IFNULL(SUM(t.amount), 0) AS total_amount,
+        MIN(t.amount) AS min_amount,
+        MAX(t.amount) AS max_amount
+    FROM Accounts a
+    LEFT JOIN Transactions t ON t.account_id = a.account_id
+    WHERE a.customer_id = %s
+    GROUP BY a.account_type, a.account_id WITH ROLLUP
+"""
+
+ROLLUP_STATS = ['transaction_count', 'total_amount', 'min_amount', 'max_amount']
+
+def split_rollup(rows):
+    # A customer without accounts gets no rollup rows at all
+    summary = {'transaction_count': 0, 'total_amount': 0, 'min_amount': None, 'max_amount': None}
+    by_account_type = []
+    by_account = []
+    for row in rows:
+        stats = {name: row[name] for name in ROLLUP_STATS}
+        if row['type_rollup']:
+            summary = stats
+        elif row['account_rollup']:
+            by_account_type.append({'account_type': row['account_type'], **stats})
+        else:
+            by_account.append({'account_id': row['account_id'], 'account_type': row['account_type'], **stats})
+    return summary, by_account_type, by_account
+
+def get_header(event, name):
+    request_headers = event.get('headers') or {}
+    for key, value in request_headers.items():
+        if key.lower() == name.lower():
+            return value
+    return None
+
+def make_etag(version):
+    return f'"v{RESPONSE_VERSION}-{version["version"] if version else 0}"'
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    # If-None-Match uses weak comparison, so W/"..." matches "..."
+    candidates = [tag[2:] if tag.startswith('W/') else tag for tag in candidates]
+    return '*' in candidates or etag in candidates
+
+# Bodies below this size are sent uncompressed; the encoding overhead isn't worth it.
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', 1024))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+SUPPORTED_ENCODINGS = ['br', 'gzip'] if brotli else ['gzip']
+
+def parse_accept_encoding(value):
+    encodings = {}
+    for part in (value or '').split(','):
+        name, _, params = part.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, val = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    quality = float(val)
+                except ValueError:
+                    quality = 0.0
+        encodings[name] = quality
+    return encodings
+
+def choose_encoding(accept_encoding):
+    encodings = parse_accept_encoding(accept_encoding)
+    for name in SUPPORTED_ENCODINGS:
+        if encodings.get(name, encodings.get('*', 0)) > 0:
+            return name
+    return None
+
+def build_response(event, status_code, headers, body):
+    raw = body.encode('utf-8')
+    encoding = None
+    if len(raw) >= COMPRESSION_MIN_BYTES:
+        encoding = choose_encoding(get_header(event, 'Accept-Encoding'))
+    if encoding is None:
+        return {
+            'statusCode': status_code,
+            'headers': headers,
+            'body': body
+        }
+
+    if encoding == 'br':
+        compressed = brotli.compress(raw, quality=BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(raw, compresslevel=GZIP_LEVEL)
+    print(f"Compressed response with {encoding}: {len(raw)} -> {len(compressed)} bytes")
+
+    headers['Content-Encoding'] = encoding
+    # The encoded bytes differ from the identity body, so the validator becomes weak
+    if 'ETag' in headers:
+        headers['ETag'] = 'W/' + headers['ETag']
+    return {
+        'statusCode': status_code,
+        'headers': headers,
+        'body': base64.b64encode(compressed).decode('ascii'),
+        'isBase64Encoded': True
+    }
+
+# Profiling is opt-in: PROFILE_ENABLED=1 profiles every invocation, otherwise a
+# request is profiled only when it carries a valid X-Profile-Signature header.
+PROFILE_ENABLED = os.environ.get('PROFILE_ENABLED') == '1'
+PROFILE_SIGNING_KEY = os.environ.get('PROFILE_SIGNING_KEY')
+PROFILE_TOP_N = int(os.environ.get('PROFILE_TOP_N', 20))
+PROFILE_OUTPUT_DIR = os.environ.get('PROFILE_OUTPUT_DIR')
+
+def sign_profile_request(customer_id, expires, key):
+    message = f"{customer_id}:{expires}".encode('utf-8')
+    return hmac.new(key.encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+def should_profile(event):
+    if PROFILE_ENABLED:
+        return True
+    if not PROFILE_SIGNING_KEY:
+        return False
+    # Header format: "<unix expiry>:<hex HMAC-SHA256 of '<customerId>:<expiry>'>"
+    signature_header = get_header(event, 'X-Profile-Signature')
+    if not signature_header:
+        return False
+    expires, _, signature = signature_header.partition(':')
+    # Caller-supplied: reject anything that isn't ASCII decimal / hex rather than raising
+    if not (expires.isascii() and expires.isdecimal()) or int(expires) < time.time():
+        return False
+    if not (signature.isascii() and len(signature) == 64 and all(c in '0123456789abcdef' for c in signature)):
+        return False
+    customer_id = (event.get('pathParameters') or {}).get('customerId')
+    expected = sign_profile_request(customer_id, expires, PROFILE_SIGNING_KEY)
+    return hmac.compare_digest(expected, signature)
+
+def run_profiled(handler, event, context):
+    request_id = getattr(context, 'aws_request_id', None) or str(int(time.time() * 1000))
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        return profiler.runcall(handler, event, context)
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stats_output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stats_output)
+        stats.sort_stats('cumulative').print_stats(PROFILE_TOP_N)
+        print(f"Profile for request {request_id}:\n{stats_output.getvalue()}")
+
+        print(f"Top {PROFILE_TOP_N} allocation sites for request {request_id} "
+              f"(current {current} bytes, peak {peak} bytes):")
+        for stat in snapshot.statistics('lineno')[:PROFILE_TOP_N]:
+            print(f"  {stat}")
+
+        if PROFILE_OUTPUT_DIR:
+            path = os.path.join(PROFILE_OUTPUT_DIR, f"get_transactions-{request_id}.prof")
+            try:
+                stats.dump_stats(path)
+                print(f"Profile written to {path}")
+            except Exception as e:
+                print(f"Failed to write profile to '{path}': {e}")
+
 def lambda_handler(event, context):
+    if should_profile(event):
+        return run_profiled(handle_request, event, context)
+    return handle_request(event, context)
+
+def handle_request(event, context):
 
     
     headers = {
         "Access-Control-Allow-Origin": "http://my-ui-bucket-anushka-1610.s3-website.ap-south-1.amazonaws.com",
-        "Access-Control-Allow-Headers": "*"
+        "Access-Control-Allow-Headers": "*",
+        "Access-Control-Expose-Headers": "ETag, Retry-After",
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding"
     }
 
     customer_id = event['pathParameters'].get('customerId')
@@ -131,6 +470,7 @@ def lambda_handler(event, context):
 
     
     print(secret, os.environ['DB_HOST'], db_name)
+    mysqlhelper = None
     try:
         mysqlhelper = MySQLHelper(
             host=os.environ['DB_HOST'],
@@ -139,33 +479,44 @@ def lambda_handler(event, context):
             db=db_name,
             port = 3306
         )
-        accounts = mysqlhelper.select_items(ACCOUNT_TABLE, where=f"customer_id = {customer_id}")
-        print(f"Accounts for customer_id {customer_id}:", accounts)
-        account_ids = [str(acc['account_id']) for acc in accounts]
-        print(f"Account IDs found: {account_ids}")
-
-
-        
-        print(f"Querying accounts for customer_id {customer_id}")
-
-        query = """
-            SELECT 
-                COUNT(*) AS transaction_count,
-                IFNULL(SUM(t.amount), 0) AS total_amount
-            FROM Transactions t
-            INNER JOIN Accounts a ON t.account_id = a.account_id
-            WHERE a.customer_id = %s
-        """
+        slot = mysqlhelper.acquire_connection_slot(DB_CONNECTION_BUDGET, admission_wait_seconds(context))
+        print(f"Admitted with connection slot {slot}")
+
         with mysqlhelper.connection.cursor() as cursor:
-            cursor.execute(query, (customer_id,))
-            result = cursor.fetchall()
+            cursor.execute(TRANSACTIONS_VERSION_QUERY, (customer_id,))
+            version = cursor.fetchone()
+
+        etag = make_etag(version)
+        headers['ETag'] = etag
+        if etag_matches(get_header(event, 'If-None-Match'), etag):
+            print(f"Transactions for customer_id {customer_id} not modified, ETag {etag}")
+            return {
+                'statusCode': 304,
+                'headers': headers,
+                'body': ''
+            }
 
-        print("Query Result:", result)
+        print(f"Querying transaction rollup for customer_id {customer_id}")
+        rows = mysqlhelper.fetch_rows(TRANSACTIONS_ROLLUP_QUERY, (customer_id,))
 
+        summary, by_account_type, by_account = split_rollup(rows)
+        print("Query Result:", summary)
+
+        body = json.dumps({
+            'status': "ok",
+            'data': [summary],
+            'by_account_type': by_account_type,
+            'by_account': by_account
+        }, default=str)
+        return build_response(event, 200, headers, body)
+
+    except ConnectionBudgetExhausted as e:
+        print(f"Rejecting request: {e}")
+        headers['Retry-After'] = str(RETRY_AFTER_SECONDS)
         return {
-            'statusCode': 200,
+            'statusCode': 503,
             'headers': headers,
-            'body': json.dumps({'status': "ok", 'data': result}, default=str)
+            'body': json.dumps({'status': "error", 'message': "Service busy, please retry"})
         }
 
     except Exception as e:
@@ -176,8 +527,7 @@ def lambda_handler(event, context):
             'headers': headers,
             'body': json.dumps({'status': "error", 'message': "Something went wrong"}, default=str)
         }
-
-
-
-
-
+    finally:
+        # Closing the session also frees the connection slot
+        if mysqlhelper:
+            mysqlhelper.close()
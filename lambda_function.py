@@ -11,6 +11,7 @@ from pymysql.cursors import DictCursor
 ACCOUNT_TABLE= "Accounts"
 TRANSACTIONS_TABLE = "Transactions"
 CUSTOMERS_TABLE = "Customers"
+CUSTOMER_VERSIONS_TABLE = "CustomerVersions"
 
 CUSTOMERS = [
     {"customer_id": 1, "name": "Alice Smith", "email": "alice@example.com", "phone": "123-456-7890"},
@@ -90,6 +91,21 @@ class MySQLHelper:
         except Exception as e:
             print(f"Insert failed for table '{table_name}': {e}")
  
+    def create_trigger(self, trigger_name, timing, table_name, body):
+        if not self.connection:
+            print("No database connection.")
+            return False
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+                query = f"CREATE TRIGGER {trigger_name} {timing} ON {table_name} FOR EACH ROW {body}"
+                cursor.execute(query)
+                print(f"Trigger `{trigger_name}` created.")
+                return True
+        except Exception as e:
+            print(f"Failed to create trigger '{trigger_name}': {e}")
+            return False
+
     def get_tables(self):
         if not self.connection:
             print("No database connection.")
@@ -133,6 +149,47 @@ class MySQLHelper:
         else:
             print("No database connection to close.")
 
+# Every write to a customer's accounts or transactions bumps that customer's
+# row in CustomerVersions; the read APIs use it as a cheap ETag version.
+# Accounts without an owner (customer_id NULL) are skipped so the triggers
+# never turn a valid write into a NOT NULL error on CustomerVersions.
+BUMP_CUSTOMER_VERSION = f"""
+    IF {{customer}} IS NOT NULL THEN
+        INSERT INTO {CUSTOMER_VERSIONS_TABLE} (customer_id, version) VALUES ({{customer}}, 1)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    END IF;
+"""
+BUMP_ACCOUNT_OWNER_VERSION = f"""
+    INSERT INTO {CUSTOMER_VERSIONS_TABLE} (customer_id, version)
+    SELECT customer_id, 1 FROM {ACCOUNT_TABLE}
+    WHERE account_id = {{account}} AND customer_id IS NOT NULL
+    ON DUPLICATE KEY UPDATE version = {CUSTOMER_VERSIONS_TABLE}.version + 1;
+"""
+
+def trigger_body(*statements):
+    return "BEGIN " + " ".join(statements) + " END"
+
+# The read APIs' ETags are only correct while all of these triggers exist.
+# Writes that bypass row triggers (TRUNCATE, DROP/recreate of a table, bulk
+# loads with triggers disabled) leave ETags stale until the next row write
+# for that customer; bump CustomerVersions by hand after such maintenance.
+CUSTOMER_VERSION_TRIGGERS = {
+    "accounts_after_insert": ("AFTER INSERT", ACCOUNT_TABLE, trigger_body(
+        BUMP_CUSTOMER_VERSION.format(customer="NEW.customer_id"))),
+    "accounts_after_update": ("AFTER UPDATE", ACCOUNT_TABLE, trigger_body(
+        BUMP_CUSTOMER_VERSION.format(customer="OLD.customer_id"),
+        BUMP_CUSTOMER_VERSION.format(customer="NEW.customer_id"))),
+    "accounts_after_delete": ("AFTER DELETE", ACCOUNT_TABLE, trigger_body(
+        BUMP_CUSTOMER_VERSION.format(customer="OLD.customer_id"))),
+    "transactions_after_insert": ("AFTER INSERT", TRANSACTIONS_TABLE, trigger_body(
+        BUMP_ACCOUNT_OWNER_VERSION.format(account="NEW.account_id"))),
+    "transactions_after_update": ("AFTER UPDATE", TRANSACTIONS_TABLE, trigger_body(
+        BUMP_ACCOUNT_OWNER_VERSION.format(account="OLD.account_id"),
+        BUMP_ACCOUNT_OWNER_VERSION.format(account="NEW.account_id"))),
+    "transactions_after_delete": ("AFTER DELETE", TRANSACTIONS_TABLE, trigger_body(
+        BUMP_ACCOUNT_OWNER_VERSION.format(account="OLD.account_id"))),
+}
+
 def test_rds_connection(host, port=3306, timeout=5):
     try:
         socket.create_connection((host, port), timeout=timeout)
@@ -212,6 +269,23 @@ def lambda_handler(event, context):
             "description": "VARCHAR(255)"
         })
  
+        mysql_helper.create_table(CUSTOMER_VERSIONS_TABLE, {
+            "customer_id": "INT PRIMARY KEY",
+            "version": "BIGINT NOT NULL"
+        })
+
+        failed_triggers = [
+            trigger_name
+            for trigger_name, (timing, table_name, body) in CUSTOMER_VERSION_TRIGGERS.items()
+            if not mysql_helper.create_trigger(trigger_name, timing, table_name, body)
+        ]
+        if failed_triggers:
+            # A missing trigger would make the read APIs answer 304 with stale data
+            return {
+                "status": "Error",
+                "message": f"Failed to create customer version triggers: {', '.join(failed_triggers)}",
+            }
+ 
         # Insert data
         for customer in CUSTOMERS:
             mysql_helper.insert_item(CUSTOMERS_TABLE, customer)
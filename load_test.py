@@ -0,0 +1,79 @@
+import argparse
+import time
+import urllib.request
+import urllib.error
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# CONFIGURATION (some values from CLI)
+BASE_URL = 'https://1cj8u8z06f.execute-api.ap-south-1.amazonaws.com/dev'
+ENDPOINTS = ['account-details', 'transaction-details']
+
+
+# CLI ARGUMENT PARSER
+def parse_args():
+    parser = argparse.ArgumentParser(description="Burst the read APIs and report how they degrade under load")
+    parser.add_argument('--base-url', default=BASE_URL, help='API Gateway stage URL')
+    parser.add_argument('--customer-id', default='1', help='Customer ID to query')
+    parser.add_argument('--requests', type=int, default=500, help='Total number of requests to send')
+    parser.add_argument('--concurrency', type=int, default=100, help='Number of requests in flight at once')
+    parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds')
+    return parser.parse_args()
+
+# SEND ONE REQUEST
+def send_request(url, timeout):
+    start = time.perf_counter()
+    retry_after = None
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+        retry_after = e.headers.get('Retry-After')
+    except Exception as e:
+        status = type(e).__name__
+    return status, time.perf_counter() - start, retry_after
+
+def percentile(values, pct):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+# RUN THE BURST AND SUMMARISE
+def run_load_test(args):
+    urls = [
+        f"{args.base_url}/{ENDPOINTS[i % len(ENDPOINTS)]}/{args.customer_id}"
+        for i in range(args.requests)
+    ]
+    print(f"Sending {args.requests} requests with concurrency {args.concurrency}...")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda url: send_request(url, args.timeout), urls))
+    elapsed = time.perf_counter() - start
+
+    counts = Counter(status for status, _, _ in results)
+    latencies = defaultdict(list)
+    for status, latency, _ in results:
+        latencies[status].append(latency)
+    missing_retry_after = sum(1 for status, _, retry_after in results if status == 503 and retry_after is None)
+
+    print(f"\nCompleted in {elapsed:.2f}s ({args.requests / elapsed:.1f} req/s)")
+    for status, count in sorted(counts.items(), key=lambda item: str(item[0])):
+        p50 = percentile(latencies[status], 50) * 1000
+        p95 = percentile(latencies[status], 95) * 1000
+        print(f"  {status}: {count} requests, p50 {p50:.0f} ms, p95 {p95:.0f} ms")
+
+    # Graceful degradation means overload shows up as fast 503s, not 500s or timeouts
+    failures = sum(count for status, count in counts.items() if status not in (200, 304, 503))
+    if missing_retry_after:
+        print(f"\n{missing_retry_after} responses with status 503 were missing Retry-After")
+    if failures:
+        print(f"\n{failures} requests failed with something other than 200/304/503")
+    else:
+        print("\nNo hard failures: excess load was shed with 503s.")
+
+# MAIN
+if __name__ == '__main__':
+    run_load_test(parse_args())
@@ -19,10 +19,12 @@ lambda_client = boto3.client('lambda', config=lambda_config)
 LAMBDA_FILE = './lambda_function.py'
 ACC_FILE = './get_accounts.py'
 TRANS_FILE = './get_transactions.py'       
+EXPORT_FILE = './export_transactions.py'
 S3_BUCKET = 'myziplambdabucktanushka1109'
 S3_KEY = 'lambda_function.zip'
 ACC_KEY = 'get_accounts.zip'
 TRANS_KEY = 'get_transactions.zip'
+EXPORT_KEY = 'export_transactions.zip'
 TEMPLATE_PATH = './rds_mysql_template.yaml'
 REGION = 'ap-south-1'
 LAMBDA_FUNCTION_NAME = 'InitMySQLTables'
@@ -132,6 +134,7 @@ def deploy_stack(stack_name, db_password):
         f'S3Key={S3_KEY}',
         f'ACCKey={ACC_KEY}',
         f'TRANSKey={TRANS_KEY}',
+        f'EXPORTKey={EXPORT_KEY}',
         f'LambdaSG={sg_id}',
         f'VPC={vpc_id}'
     ], check=True)
@@ -230,6 +233,7 @@ if __name__ == '__main__':
     package_and_upload_lambda(LAMBDA_FILE, S3_KEY)
     package_and_upload_lambda(ACC_FILE, ACC_KEY)
     package_and_upload_lambda(TRANS_FILE, TRANS_KEY)
+    package_and_upload_lambda(EXPORT_FILE, EXPORT_KEY)
     deploy_stack(args.stack_name, args.db_password)
     invoke_lambda()
     upload_static_site()
\ No newline at end of file